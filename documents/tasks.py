@@ -719,8 +719,10 @@ def execute_merge(self, project_id):
         
         # 커스텀 매핑이 있으면 적용
         if project.column_mapping:
+            grouped_mapping = {}
             for original, standard in project.column_mapping.items():
-                service.column_mapper.add_mapping(standard, [original])
+                grouped_mapping.setdefault(standard, []).append(original)
+            service.column_mapper.bulk_add(grouped_mapping)
         
         merge_files = project.files.all()
         file_paths = [mf.file.path for mf in merge_files]
@@ -222,6 +222,25 @@ class ColumnMapper:
         for alias in aliases:
             self._reverse_index[alias.lower()] = standard_name
     
+    def bulk_add(self, mapping: Dict[str, List[str]]):
+        """
+        매핑 규칙 일괄 추가
+        
+        Args:
+            mapping: 추가할 매핑 (키: 표준명, 값: 유사어 리스트)
+        """
+        reverse_index: Dict[str, str] = {}
+        for standard_name, aliases in mapping.items():
+            # 기본 매핑 리스트(클래스 속성)를 직접 수정하지 않도록 새 리스트로 교체
+            self.mappings[standard_name] = [*self.mappings.get(standard_name, ()), *aliases]
+            
+            reverse_index[standard_name.lower()] = standard_name
+            for alias in aliases:
+                reverse_index[alias.lower()] = standard_name
+        
+        # 역방향 인덱스 한 번에 갱신
+        self._reverse_index.update(reverse_index)
+    
     def _clean_name(self, name: str) -> str:
         """열 이름 정리"""
         cleaned = str(name).strip().lower()
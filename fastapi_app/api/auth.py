@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from ..db.session import get_db
+from ..core.dependencies import get_db_with_commit
 from ..schemas.user import UserCreate, UserResponse, Token
 from ..models.user import User
 from ..core.security import get_password_hash, verify_password, create_access_token, create_refresh_token
@@ -10,14 +11,19 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(
+    user_data: UserCreate,
+    db: Session = Depends(get_db_with_commit, scope="function")
+):
     """사용자 등록"""
     # 중복 체크
-    existing_user = db.query(User).filter(
-        (User.username == user_data.username) | (User.email == user_data.email)
-    ).first()
+    taken = db.query(
+        db.query(User.id).filter(
+            (User.username == user_data.username) | (User.email == user_data.email)
+        ).exists()
+    ).scalar()
     
-    if existing_user:
+    if taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 존재하는 사용자명 또는 이메일입니다"
@@ -1,39 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional
 from datetime import datetime
 import os
 import shutil
 import logging
+import anyio
+import aiofiles
 from pathlib import Path
 from ..db.session import get_db
 from ..schemas.document import (
     DocumentResponse, DocumentList, UploadResponse,
-    ExtractedDataResponse, ReportResponse, ReportCreate,
+    ExtractedDataResponse, ReportList, ReportCreate,
     FileType, DocumentStatus
 )
 from ..schemas.response import success_response, error_response, paginated_response
 from ..models.user import User
 from ..models.document import Document, ExtractedData, Report
-from ..core.dependencies import get_current_active_user
+from ..core.dependencies import get_current_active_user, get_owned_document, get_db_with_commit
 from ..core.config import settings
+from ..core.files import file_download_response
 from ..tasks.document_tasks import process_document_task
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def save_upload_file(upload_file: UploadFile, file_type: FileType) -> tuple[str, str]:
-    """파일 저장 및 경로 반환"""
+def build_upload_path(original_filename: str) -> Path:
+    """업로드 파일 저장 경로 생성"""
+    # 디렉토리와 파일명이 같은 시각을 쓰도록 한 번만 조회
+    now = datetime.now()
+    
     # 디렉토리 생성
-    upload_dir = Path(settings.UPLOAD_DIR) / datetime.now().strftime("%Y/%m/%d")
+    upload_dir = Path(settings.UPLOAD_DIR) / now.strftime("%Y/%m/%d")
     upload_dir.mkdir(parents=True, exist_ok=True)
     
     # 파일명 생성 (타임스탬프 추가)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{upload_file.filename}"
-    file_path = upload_dir / filename
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    filename = f"{timestamp}_{original_filename}"
+    return upload_dir / filename
+
+
+def save_upload_file(upload_file: UploadFile, file_type: FileType) -> tuple[str, str]:
+    """파일 저장 및 경로 반환"""
+    file_path = build_upload_path(upload_file.filename)
     
     # 파일 저장
     with file_path.open("wb") as buffer:
@@ -47,15 +57,15 @@ async def upload_document(
     file: UploadFile = File(...),
     file_type: FileType = Form(...),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """문서 업로드"""
     # 파일 확장자 검증
     file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in settings.ALLOWED_EXTENSIONS:
+    if file_ext not in settings.ALLOWED_EXTENSIONS_SET:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"지원하지 않는 파일 형식입니다. 허용: {', '.join(settings.ALLOWED_EXTENSIONS)}"
+            detail=f"지원하지 않는 파일 형식입니다. 허용: {settings.ALLOWED_EXTENSIONS_JOINED}"
         )
     
     # 파일 크기 검증
@@ -69,8 +79,8 @@ async def upload_document(
             detail=f"파일 크기가 너무 큽니다. 최대: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
         )
     
-    # 파일 저장
-    file_path, original_filename = save_upload_file(file, file_type)
+    # 파일 저장 (디렉토리 생성/복사는 블로킹 I/O이므로 워커 스레드에서 실행)
+    file_path, original_filename = await anyio.to_thread.run_sync(save_upload_file, file, file_type)
     
     # DB에 문서 정보 저장
     document = Document(
@@ -87,7 +97,68 @@ async def upload_document(
     db.refresh(document)
     
     # Celery 태스크 실행
-    process_document_task.delay(document.id)
+    await anyio.to_thread.run_sync(process_document_task.delay, document.id)
+    
+    return {
+        "message": "파일이 업로드되었으며 처리가 시작되었습니다",
+        "document_id": document.id,
+        "filename": original_filename,
+        "status": document.status
+    }
+
+
+@router.post("/upload-stream", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_document_stream(
+    request: Request,
+    filename: str,
+    file_type: FileType,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db_with_commit, scope="function")
+):
+    """문서 업로드 (요청 본문을 multipart 없이 바로 디스크에 스트리밍)"""
+    original_filename = Path(filename).name
+    
+    # 파일 확장자 검증
+    file_ext = Path(original_filename).suffix.lower()
+    if file_ext not in settings.ALLOWED_EXTENSIONS_SET:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 파일 형식입니다. 허용: {settings.ALLOWED_EXTENSIONS_JOINED}"
+        )
+    
+    # 파일 저장 (청크 단위, 크기 초과 시 중단), 디렉토리 생성은 워커 스레드에서 실행
+    file_path = await anyio.to_thread.run_sync(build_upload_path, original_filename)
+    file_size = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as buffer:
+            async for chunk in request.stream():
+                file_size += len(chunk)
+                if file_size > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"파일 크기가 너무 큽니다. 최대: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+                    )
+                await buffer.write(chunk)
+    except Exception:
+        await anyio.to_thread.run_sync(file_path.unlink, True)
+        raise
+    
+    # DB에 문서 정보 저장
+    document = Document(
+        user_id=current_user.id,
+        original_filename=original_filename,
+        file_path=str(file_path),
+        file_type=file_type,
+        file_size=file_size,
+        status=DocumentStatus.PENDING
+    )
+    
+    db.add(document)
+    db.commit()
+    db.refresh(document)
+    
+    # Celery 태스크 실행
+    await anyio.to_thread.run_sync(process_document_task.delay, document.id)
     
     return {
         "message": "파일이 업로드되었으며 처리가 시작되었습니다",
@@ -122,49 +193,24 @@ async def list_documents(
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
-    document_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    document: Document = Depends(get_owned_document)
 ):
     """문서 상세 조회"""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
-    
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다"
-        )
-    
     return document
 
 
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
-    document_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    document: Document = Depends(get_owned_document),
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """문서 삭제"""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
-    
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다"
-        )
-    
     # 파일 삭제
     try:
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
+        if await anyio.to_thread.run_sync(os.path.exists, document.file_path):
+            await anyio.to_thread.run_sync(os.remove, document.file_path)
     except Exception as e:
-        print(f"파일 삭제 오류: {e}")
+        logger.warning("파일 삭제 오류", exc_info=e)
     
     db.delete(document)
     db.commit()
@@ -174,22 +220,10 @@ async def delete_document(
 
 @router.post("/{document_id}/reprocess", response_model=DocumentResponse)
 async def reprocess_document(
-    document_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    document: Document = Depends(get_owned_document),
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """문서 재처리"""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
-    
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다"
-        )
-    
     if document.status == DocumentStatus.PROCESSING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -201,7 +235,7 @@ async def reprocess_document(
     db.commit()
     
     # Celery 태스크 실행
-    process_document_task.delay(document.id)
+    await anyio.to_thread.run_sync(process_document_task.delay, document.id)
     
     return document
 
@@ -213,10 +247,13 @@ async def get_extracted_data(
     db: Session = Depends(get_db)
 ):
     """추출된 데이터 조회"""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    # 문서 소유 확인과 추출 데이터 조회를 한 번의 JOIN 쿼리로 처리
+    document = await anyio.to_thread.run_sync(
+        lambda: db.query(Document).options(joinedload(Document.extracted_data)).filter(
+            Document.user_id == current_user.id,
+            Document.id == document_id
+        ).first()
+    )
     
     if not document:
         raise HTTPException(
@@ -233,47 +270,29 @@ async def get_extracted_data(
     return document.extracted_data
 
 
-@router.get("/{document_id}/reports", response_model=List[ReportResponse])
+@router.get("/{document_id}/reports", response_model=ReportList)
 async def get_document_reports(
-    document_id: int,
-    current_user: User = Depends(get_current_active_user),
+    skip: int = 0,
+    limit: int = 20,
+    document: Document = Depends(get_owned_document),
     db: Session = Depends(get_db)
 ):
     """문서의 리포트 목록"""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    query = db.query(Report).filter(Report.document_id == document.id)
     
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다"
-        )
-
-    return document.reports
+    total = query.count()
+    reports = query.order_by(Report.id.desc()).offset(skip).limit(limit).all()
+    
+    return {"total": total, "reports": reports}
 
 
 @router.get("/{document_id}/download")
 async def download_document(
-    document_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    document: Document = Depends(get_owned_document),
+    current_user: User = Depends(get_current_active_user)
 ):
     """원본 파일 다운로드"""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
-    
-    if not document:
-        logger.warning(f"문서 다운로드 실패 - 문서 없음: {document_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다"
-        )
-    
-    if not os.path.exists(document.file_path):
+    if not await anyio.to_thread.run_sync(os.path.exists, document.file_path):
         logger.error(f"문서 파일 없음: {document.file_path}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -282,7 +301,7 @@ async def download_document(
     
     logger.info(f"파일 다운로드: {document.original_filename} (user: {current_user.id})")
     
-    return FileResponse(
+    return file_download_response(
         path=document.file_path,
         filename=document.original_filename,
         media_type="application/octet-stream"
@@ -2,51 +2,74 @@
 FastAPI 파일 병합 API 엔드포인트
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import datetime
 import os
-import shutil
+import asyncio
 import logging
 from pathlib import Path
+import aiofiles
+import anyio
 
 from ..db.session import get_db
 from ..schemas.document import (
     MergeProjectCreate, MergeProjectResponse, MergeProjectList,
-    MergeFileResponse, UpdateMappingRequest,
-    MappingTemplateCreate, MappingTemplateResponse,
+    MergeFileList, UpdateMappingRequest,
+    MappingTemplateCreate, MappingTemplateResponse, MappingTemplateList,
 )
 from ..schemas.response import success_response, error_response
 from ..models.user import User
 from ..models.document import MergeProject, MergeFile, ColumnMappingTemplate
-from ..core.dependencies import get_current_active_user
+from ..core.dependencies import get_current_active_user, get_owned_project, get_db_with_commit
 from ..core.config import settings
+from ..core.files import file_download_response
 from ..tasks.document_tasks import analyze_merge_files_task, execute_merge_task
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# 파일 동시 저장/삭제 개수
+FILE_IO_CONCURRENCY = 8
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
-def save_merge_file(upload_file: UploadFile) -> tuple[str, str, int]:
-    """병합 대상 파일 저장"""
-    upload_dir = Path(settings.UPLOAD_DIR) / "merge_sources" / datetime.now().strftime("%Y/%m/%d")
+
+def build_merge_upload_path(original_filename: str) -> Path:
+    """병합 대상 파일 저장 경로 생성"""
+    # 디렉토리와 파일명이 같은 시각을 쓰도록 한 번만 조회
+    now = datetime.now()
+    upload_dir = Path(settings.UPLOAD_DIR) / "merge_sources" / now.strftime("%Y/%m/%d")
     upload_dir.mkdir(parents=True, exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{upload_file.filename}"
-    file_path = upload_dir / filename
-    
-    upload_file.file.seek(0, 2)
-    file_size = upload_file.file.tell()
-    upload_file.file.seek(0)
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    filename = f"{timestamp}_{original_filename}"
+    return upload_dir / filename
+
+
+async def save_merge_file(upload_file: UploadFile) -> tuple[str, str, int]:
+    """병합 대상 파일 저장"""
+    # 디렉토리 생성은 블로킹 I/O이므로 워커 스레드에서 실행
+    file_path = await anyio.to_thread.run_sync(build_merge_upload_path, upload_file.filename)
     
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+    file_size = 0
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
+            file_size += len(chunk)
     
     return str(file_path), upload_file.filename, file_size
 
 
+def remove_file_if_exists(path: str):
+    """파일이 있으면 삭제 (오류 무시)"""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
+
+
 # ========================
 # 병합 프로젝트 엔드포인트
 # ========================
@@ -55,7 +78,7 @@ def save_merge_file(upload_file: UploadFile) -> tuple[str, str, int]:
 async def create_merge_project(
     data: MergeProjectCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """병합 프로젝트 생성"""
     project = MergeProject(
@@ -85,57 +108,66 @@ async def list_merge_projects(
         query = query.filter(MergeProject.status == status_filter)
     
     total = query.count()
-    projects = query.order_by(MergeProject.created_at.desc()).offset(skip).limit(limit).all()
+    # 응답에 포함되는 파일 목록을 프로젝트마다 따로 조회하지 않도록 한 번에 로드
+    projects = (
+        query.options(selectinload(MergeProject.files))
+        .order_by(MergeProject.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
     
     return {"total": total, "projects": projects}
 
 
-@router.get("/{project_id}", response_model=MergeProjectResponse)
-async def get_merge_project(
-    project_id: int,
+# /{project_id} 보다 먼저 등록해야 /templates 경로가 가려지지 않음
+@router.get("/templates", response_model=MappingTemplateList)
+async def list_templates(
+    skip: int = 0,
+    limit: int = 50,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """프로젝트 상세"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
+    """템플릿 목록"""
+    query = db.query(ColumnMappingTemplate).filter(
+        or_(
+            ColumnMappingTemplate.user_id == current_user.id,
+            ColumnMappingTemplate.is_public
+        )
+    )
     
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+    total = query.count()
+    templates = query.order_by(ColumnMappingTemplate.id.desc()).offset(skip).limit(limit).all()
     
+    return {"total": total, "templates": templates}
+
+
+@router.get("/{project_id}", response_model=MergeProjectResponse)
+async def get_merge_project(
+    project: MergeProject = Depends(get_owned_project)
+):
+    """프로젝트 상세"""
     return project
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_merge_project(
-    project_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    project: MergeProject = Depends(get_owned_project),
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """프로젝트 삭제"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
+    # 파일 삭제 (동시 삭제 수 제한)
+    paths = [mf.file_path for mf in project.files]
+    if project.merged_file_path:
+        paths.append(project.merged_file_path)
     
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+    sem = asyncio.Semaphore(FILE_IO_CONCURRENCY)
     
-    # 파일 삭제
-    for mf in project.files:
-        try:
-            if os.path.exists(mf.file_path):
-                os.remove(mf.file_path)
-        except Exception:
-            pass
+    async def _remove(path: str):
+        async with sem:
+            await anyio.to_thread.run_sync(remove_file_if_exists, path)
     
-    if project.merged_file_path and os.path.exists(project.merged_file_path):
-        try:
-            os.remove(project.merged_file_path)
-        except Exception:
-            pass
+    await asyncio.gather(*[_remove(p) for p in paths])
     
     db.delete(project)
     db.commit()
@@ -144,20 +176,11 @@ async def delete_merge_project(
 
 @router.post("/{project_id}/upload-files", status_code=status.HTTP_201_CREATED)
 async def upload_merge_files(
-    project_id: int,
     files: List[UploadFile] = File(...),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    project: MergeProject = Depends(get_owned_project),
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """파일 업로드"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
     if project.status not in ("draft", "ready", "failed"):
         raise HTTPException(
             status_code=400,
@@ -174,17 +197,26 @@ async def upload_merge_files(
                 detail=f"'{f.filename}': 엑셀 파일만 업로드 가능합니다 (.xlsx, .xls)"
             )
     
-    created = []
-    for f in files:
-        file_path, original_name, file_size = save_merge_file(f)
-        merge_file = MergeFile(
-            project_id=project.id,
-            file_path=file_path,
-            original_filename=original_name,
-            file_size=file_size,
-        )
-        db.add(merge_file)
-        created.append(merge_file)
+    # 파일 저장 (동시 저장 수 제한)
+    sem = asyncio.Semaphore(FILE_IO_CONCURRENCY)
+    
+    async def _save(f: UploadFile):
+        async with sem:
+            return await save_merge_file(f)
+    
+    saved = await asyncio.gather(*[_save(f) for f in files])
+    
+    # 한 번의 executemany INSERT로 저장
+    rows = [
+        {
+            "project_id": project.id,
+            "file_path": file_path,
+            "original_filename": original_name,
+            "file_size": file_size,
+        }
+        for file_path, original_name, file_size in saved
+    ]
+    db.execute(insert(MergeFile), rows)
     
     if project.status != "draft":
         project.status = "draft"
@@ -192,26 +224,17 @@ async def upload_merge_files(
     db.commit()
     
     return success_response(
-        data={"uploaded_count": len(created)},
-        message=f"{len(created)}개 파일이 업로드되었습니다"
+        data={"uploaded_count": len(rows)},
+        message=f"{len(rows)}개 파일이 업로드되었습니다"
     )
 
 
 @router.post("/{project_id}/analyze")
 async def analyze_merge_project(
-    project_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    project: MergeProject = Depends(get_owned_project),
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """파일 분석 시작 (1단계)"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
     if not project.files:
         raise HTTPException(status_code=400, detail="분석할 파일이 없습니다")
     
@@ -221,7 +244,7 @@ async def analyze_merge_project(
     project.status = "analyzing"
     db.commit()
     
-    analyze_merge_files_task.delay(project.id)
+    await anyio.to_thread.run_sync(analyze_merge_files_task.delay, project.id)
     
     return success_response(
         data={"project_id": project.id},
@@ -231,20 +254,11 @@ async def analyze_merge_project(
 
 @router.put("/{project_id}/mapping")
 async def update_mapping(
-    project_id: int,
     data: UpdateMappingRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    project: MergeProject = Depends(get_owned_project),
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """매핑 규칙 업데이트 (2단계)"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
     if data.column_mapping is not None:
         project.column_mapping = data.column_mapping
     if data.date_columns is not None:
@@ -255,37 +269,29 @@ async def update_mapping(
         project.date_output_format = data.date_output_format
     
     project.status = "ready"
+    # 커밋 후 만료된 속성을 다시 읽지 않도록 응답 데이터를 먼저 구성
+    result = {"project_id": project.id, "status": project.status}
     db.commit()
-    db.refresh(project)
     
     return success_response(
-        data={"project_id": project.id, "status": project.status},
+        data=result,
         message="매핑 규칙이 업데이트되었습니다"
     )
 
 
 @router.post("/{project_id}/execute")
 async def execute_merge(
-    project_id: int,
-    current_user: User = Depends(get_current_active_user),
+    project: MergeProject = Depends(get_owned_project),
     db: Session = Depends(get_db)
 ):
     """병합 실행 (3단계)"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
     if project.status not in ("ready", "failed"):
         raise HTTPException(
             status_code=400,
             detail=f"현재 상태({project.status})에서는 병합을 실행할 수 없습니다"
         )
     
-    execute_merge_task.delay(project.id)
+    await anyio.to_thread.run_sync(execute_merge_task.delay, project.id)
     
     return success_response(
         data={"project_id": project.id},
@@ -295,75 +301,56 @@ async def execute_merge(
 
 @router.get("/{project_id}/download")
 async def download_merged_file(
-    project_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    project: MergeProject = Depends(get_owned_project)
 ):
     """병합 결과 다운로드"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
-    if not project.merged_file_path or not os.path.exists(project.merged_file_path):
+    if not project.merged_file_path or not await anyio.to_thread.run_sync(
+        os.path.exists, project.merged_file_path
+    ):
         raise HTTPException(status_code=404, detail="병합 결과 파일이 없습니다")
     
     filename = f"{project.name}_병합결과.xlsx"
-    return FileResponse(
+    return file_download_response(
         path=project.merged_file_path,
         filename=filename,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
 
-@router.get("/{project_id}/files", response_model=List[MergeFileResponse])
+@router.get("/{project_id}/files", response_model=MergeFileList)
 async def list_project_files(
-    project_id: int,
-    current_user: User = Depends(get_current_active_user),
+    skip: int = 0,
+    limit: int = 50,
+    project: MergeProject = Depends(get_owned_project),
     db: Session = Depends(get_db)
 ):
     """프로젝트 파일 목록"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
+    query = db.query(MergeFile).filter(MergeFile.project_id == project.id)
     
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+    total = query.count()
+    files = query.order_by(MergeFile.id.desc()).offset(skip).limit(limit).all()
     
-    return project.files
+    return {"total": total, "files": files}
 
 
 @router.delete("/{project_id}/files/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_project_file(
-    project_id: int,
     file_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    project: MergeProject = Depends(get_owned_project),
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """프로젝트에서 파일 제거"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
     merge_file = db.query(MergeFile).filter(
         MergeFile.id == file_id,
-        MergeFile.project_id == project_id
+        MergeFile.project_id == project.id
     ).first()
     
     if not merge_file:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
     
     try:
-        if os.path.exists(merge_file.file_path):
-            os.remove(merge_file.file_path)
+        if await anyio.to_thread.run_sync(os.path.exists, merge_file.file_path):
+            await anyio.to_thread.run_sync(os.remove, merge_file.file_path)
     except Exception:
         pass
     
@@ -380,7 +367,7 @@ async def remove_project_file(
 async def create_template(
     data: MappingTemplateCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """매핑 템플릿 생성"""
     template = ColumnMappingTemplate(
@@ -392,7 +379,7 @@ async def create_template(
         number_columns=data.number_columns,
         date_output_format=data.date_output_format,
         custom_aliases=data.custom_aliases,
-        is_public=1 if data.is_public else 0,
+        is_public=data.is_public,
     )
     db.add(template)
     db.commit()
@@ -400,44 +387,19 @@ async def create_template(
     return template
 
 
-@router.get("/templates", response_model=List[MappingTemplateResponse])
-async def list_templates(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """템플릿 목록"""
-    from sqlalchemy import or_
-    templates = db.query(ColumnMappingTemplate).filter(
-        or_(
-            ColumnMappingTemplate.user_id == current_user.id,
-            ColumnMappingTemplate.is_public == 1
-        )
-    ).all()
-    return templates
-
-
 @router.post("/{project_id}/apply-template")
 async def apply_template_to_project(
-    project_id: int,
     template_id: int,
+    project: MergeProject = Depends(get_owned_project),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """프로젝트에 템플릿 적용"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
-    from sqlalchemy import or_
     template = db.query(ColumnMappingTemplate).filter(
         ColumnMappingTemplate.id == template_id,
         or_(
             ColumnMappingTemplate.user_id == current_user.id,
-            ColumnMappingTemplate.is_public == 1
+            ColumnMappingTemplate.is_public
         )
     ).first()
     
@@ -459,21 +421,13 @@ async def apply_template_to_project(
 
 @router.post("/{project_id}/save-as-template", response_model=MappingTemplateResponse)
 async def save_project_as_template(
-    project_id: int,
     name: str = Form(...),
     description: str = Form(""),
+    project: MergeProject = Depends(get_owned_project),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """프로젝트 매핑을 템플릿으로 저장"""
-    project = db.query(MergeProject).filter(
-        MergeProject.id == project_id,
-        MergeProject.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-    
     template = ColumnMappingTemplate(
         user_id=current_user.id,
         name=name,
@@ -4,7 +4,7 @@ from typing import List
 from ..db.session import get_db
 from ..schemas.user import UserResponse, UserUpdate
 from ..models.user import User
-from ..core.dependencies import get_current_active_user
+from ..core.dependencies import get_current_active_user, invalidate_user_cache, get_db_with_commit
 
 router = APIRouter()
 
@@ -21,16 +21,18 @@ async def get_current_user_info(
 async def update_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_with_commit, scope="function")
 ):
     """프로필 업데이트"""
     if user_update.email:
         # 이메일 중복 체크
-        existing = db.query(User).filter(
-            User.email == user_update.email,
-            User.id != current_user.id
-        ).first()
-        if existing:
+        taken = db.query(
+            db.query(User.id).filter(
+                User.email == user_update.email,
+                User.id != current_user.id
+            ).exists()
+        ).scalar()
+        if taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="이미 사용 중인 이메일입니다"
@@ -44,7 +46,7 @@ async def update_profile(
         current_user.department = user_update.department
     
     db.commit()
-    db.refresh(current_user)
+    invalidate_user_cache(current_user.id)
     
     return current_user
 
@@ -56,6 +58,9 @@ async def get_user(
     current_user: User = Depends(get_current_active_user)
 ):
     """특정 사용자 정보 조회"""
+    if user_id == current_user.id:
+        return current_user
+    
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -4,9 +4,8 @@ from sqlalchemy.orm import Session
 import logging
 
 from ..core.websocket import manager
-from ..core.security import decode_token
+from ..core.dependencies import decode_user_id, load_user
 from ..db.session import get_db
-from ..models.user import User
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -21,24 +20,13 @@ async def websocket_endpoint(
     """WebSocket 연결 엔드포인트"""
     
     # 토큰 검증
-    payload = decode_token(token)
-    if not payload:
+    user_id = decode_user_id(token)
+    if user_id is None:
         await websocket.close(code=1008, reason="Invalid token")
         return
     
-    user_id_str = payload.get("sub")
-    if not user_id_str:
-        await websocket.close(code=1008, reason="Invalid token")
-        return
-    
-    try:
-        user_id = int(user_id_str)
-    except (TypeError, ValueError):
-        await websocket.close(code=1008, reason="Invalid token")
-        return
-    
-    # 사용자 확인
-    user = db.query(User).filter(User.id == user_id).first()
+    # 사용자 확인 (최근 확인된 활성 사용자는 DB 조회 생략)
+    user = await load_user(db, user_id)
     if not user or not user.is_active:
         await websocket.close(code=1008, reason="User not found or inactive")
         return
@@ -58,8 +46,9 @@ async def websocket_endpoint(
         )
         
         # 메시지 수신 루프
+        # 죽은 연결 정리는 uvicorn의 프로토콜 수준 ping/pong(ws_ping_interval/ws_ping_timeout)에 맡김
+        # (수신만 하는 클라이언트도 응답 없이 연결이 유지됨)
         while True:
-            # 클라이언트로부터 메시지 수신 (keep-alive)
             data = await websocket.receive_text()
             logger.debug(f"메시지 수신 from user {user_id}: {data}")
             
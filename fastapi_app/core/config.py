@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import List
+from functools import cached_property
 
 
 class Settings(BaseSettings):
@@ -11,6 +12,9 @@ class Settings(BaseSettings):
     
     # 데이터베이스
     DATABASE_URL: str = "sqlite:///./fastapi_db.sqlite3"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 3600  # 초
     
     # JWT 설정
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
@@ -24,6 +28,11 @@ class Settings(BaseSettings):
         "http://127.0.0.1:3000",
     ]
     
+    # 미디어 (USE_X_ACCEL_REDIRECT=True면 Nginx가 MEDIA_URL을 internal location으로 서빙)
+    MEDIA_ROOT: str = "media"
+    MEDIA_URL: str = "/media/"
+    USE_X_ACCEL_REDIRECT: bool = False
+    
     # 파일 업로드
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     UPLOAD_DIR: str = "media/documents"
@@ -32,6 +41,16 @@ class Settings(BaseSettings):
         ".jpg", ".jpeg", ".png"
     ]
     
+    @cached_property
+    def ALLOWED_EXTENSIONS_SET(self) -> frozenset:
+        """허용 확장자 집합 (O(1) 조회용)"""
+        return frozenset(self.ALLOWED_EXTENSIONS)
+    
+    @cached_property
+    def ALLOWED_EXTENSIONS_JOINED(self) -> str:
+        """오류 메시지용 허용 확장자 문자열"""
+        return ", ".join(self.ALLOWED_EXTENSIONS)
+    
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
@@ -1,41 +1,112 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError
+from cachetools import TLRUCache, TTLCache
+from typing import Optional
+import hashlib
+import time
+import anyio
 from ..db.session import get_db
 from ..core.security import decode_token
 from ..models.user import User
+from ..models.document import Document, MergeProject
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """현재 인증된 사용자 가져오기"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="인증 정보를 확인할 수 없습니다",
-        headers={"WWW-Authenticate": "Bearer"},
+# 활성 사용자 캐시 (user_id -> 세션에서 분리된 User), 요청마다 사용자 조회 생략
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+
+
+# 토큰 디코드 결과 캐시 (토큰 SHA-256 앞 16바이트 -> (user_id, exp))
+# 항목 수명은 최대 PAYLOAD_CACHE_TTL초이며 토큰 만료 시각(exp)을 넘지 않음
+PAYLOAD_CACHE_TTL = 60
+
+
+def _payload_ttu(_key, entry: tuple[int, float], now: float) -> float:
+    return min(now + PAYLOAD_CACHE_TTL, entry[1])
+
+
+_payload_cache = TLRUCache(maxsize=10000, ttu=_payload_ttu, timer=time.time)
+
+
+def invalidate_user_cache(user_id: int):
+    """사용자 캐시 무효화"""
+    _user_cache.pop(user_id, None)
+
+
+async def load_user(db: Session, user_id: int) -> Optional[User]:
+    """사용자 조회 (활성 사용자는 캐시해 두고 현재 세션에 다시 연결해 반환)"""
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return db.merge(cached, load=False)
+    
+    # 동기 세션 I/O는 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+    user = await anyio.to_thread.run_sync(
+        lambda: db.query(User).filter(User.id == user_id).first()
     )
+    if user is not None and user.is_active:
+        db.expunge(user)
+        _user_cache[user_id] = user
+        user = db.merge(user, load=False)
+    return user
+
+
+def decode_user_id(token: str) -> Optional[int]:
+    """캐시를 거쳐 토큰의 사용자 ID 반환 (유효하지 않은 토큰은 캐시하지 않음)"""
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    entry = _payload_cache.get(key)
+    if entry is not None:
+        return entry[0]
     
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
-    
-    user_id_str: str = payload.get("sub")
-    if user_id_str is None:
-        raise credentials_exception
+        return None
     
     try:
-        user_id = int(user_id_str)
+        user_id = int(payload.get("sub"))
     except (TypeError, ValueError):
-        raise credentials_exception
+        return None
+    
+    _payload_cache[key] = (user_id, payload.get("exp", 0))
+    return user_id
+
+
+def _credentials_exception() -> HTTPException:
+    """인증 실패 예외 (실패 경로에서만 생성)"""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="인증 정보를 확인할 수 없습니다",
+        headers=_BEARER_HEADERS,
+    )
+
+
+def get_db_with_commit(db: Session = Depends(get_db)):
+    """쓰기 엔드포인트용 세션 (scope="function"으로 사용하면 응답 전송 전에 커밋)"""
+    yield db
+    db.commit()
+
+
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """현재 인증된 사용자 가져오기"""
+    # 같은 요청 안에서는 이미 조회한 사용자 재사용
+    cached_user = getattr(request.state, "user", None)
+    if cached_user is not None:
+        return cached_user
+    
+    user_id = decode_user_id(token)
+    if user_id is None:
+        raise _credentials_exception()
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await load_user(db, user_id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     if not user.is_active:
         raise HTTPException(
@@ -43,6 +114,7 @@ async def get_current_user(
             detail="비활성화된 사용자입니다"
         )
     
+    request.state.user = user
     return user
 
 
@@ -51,3 +123,44 @@ async def get_current_active_user(
 ) -> User:
     """활성화된 현재 사용자 가져오기"""
     return current_user
+
+
+async def get_owned_document(
+    document_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Document:
+    """현재 사용자 소유의 문서 가져오기"""
+    document = await anyio.to_thread.run_sync(
+        lambda: db.query(Document).filter(
+            Document.user_id == current_user.id,
+            Document.id == document_id
+        ).first()
+    )
+    
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다"
+        )
+    
+    return document
+
+
+async def get_owned_project(
+    project_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> MergeProject:
+    """현재 사용자 소유의 병합 프로젝트 가져오기"""
+    project = await anyio.to_thread.run_sync(
+        lambda: db.query(MergeProject).filter(
+            MergeProject.user_id == current_user.id,
+            MergeProject.id == project_id
+        ).first()
+    )
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+    
+    return project
@@ -1,21 +1,45 @@
 """전역 예외 핸들러"""
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from jose import JWTError
+from typing import Any
 import logging
+import orjson
 
 from ..schemas.response import error_response
 
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """orjson으로 직렬화하는 JSON 응답"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# 내용이 바뀌지 않는 에러 응답 본문은 미리 직렬화
+_DB_ERROR_BODY = orjson.dumps(error_response(
+    message="데이터베이스 처리 중 오류가 발생했습니다",
+    error_code="DATABASE_ERROR"
+))
+_INVALID_TOKEN_BODY = orjson.dumps(error_response(
+    message="인증 토큰이 유효하지 않습니다",
+    error_code="INVALID_TOKEN"
+))
+_INTERNAL_ERROR_BODY = orjson.dumps(error_response(
+    message="서버 내부 오류가 발생했습니다",
+    error_code="INTERNAL_ERROR"
+))
+
+
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """입력 검증 오류 핸들러"""
     logger.warning(f"입력 검증 실패: {exc.errors()}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=error_response(
             message="입력 데이터가 올바르지 않습니다",
@@ -29,12 +53,10 @@ async def database_exception_handler(request: Request, exc: SQLAlchemyError):
     """데이터베이스 오류 핸들러"""
     logger.error(f"데이터베이스 오류: {str(exc)}", exc_info=True)
     
-    return JSONResponse(
+    return Response(
+        content=_DB_ERROR_BODY,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response(
-            message="데이터베이스 처리 중 오류가 발생했습니다",
-            error_code="DATABASE_ERROR"
-        )
+        media_type="application/json"
     )
 
 
@@ -42,13 +64,11 @@ async def jwt_exception_handler(request: Request, exc: JWTError):
     """JWT 오류 핸들러"""
     logger.warning(f"JWT 오류: {str(exc)}")
     
-    return JSONResponse(
+    return Response(
+        content=_INVALID_TOKEN_BODY,
         status_code=status.HTTP_401_UNAUTHORIZED,
-        content=error_response(
-            message="인증 토큰이 유효하지 않습니다",
-            error_code="INVALID_TOKEN"
-        ),
-        headers={"WWW-Authenticate": "Bearer"}
+        headers={"WWW-Authenticate": "Bearer"},
+        media_type="application/json"
     )
 
 
@@ -56,12 +76,10 @@ async def general_exception_handler(request: Request, exc: Exception):
     """일반 예외 핸들러"""
     logger.error(f"처리되지 않은 예외: {str(exc)}", exc_info=True)
     
-    return JSONResponse(
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response(
-            message="서버 내부 오류가 발생했습니다",
-            error_code="INTERNAL_ERROR"
-        )
+        media_type="application/json"
     )
 
 
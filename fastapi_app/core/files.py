@@ -0,0 +1,34 @@
+"""파일 다운로드 응답"""
+from fastapi import Response
+from fastapi.responses import FileResponse
+from urllib.parse import quote
+import os
+
+from .config import settings
+
+_MEDIA_ROOT = os.path.abspath(settings.MEDIA_ROOT)
+
+
+def _content_disposition(filename: str) -> str:
+    """Content-Disposition 헤더 값 (비 ASCII 파일명은 RFC 5987 형식)"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def file_download_response(path: str, filename: str, media_type: str) -> Response:
+    """파일 다운로드 응답 (USE_X_ACCEL_REDIRECT 설정 시 Nginx가 X-Accel-Redirect로 직접 전송)"""
+    if settings.USE_X_ACCEL_REDIRECT:
+        relative = os.path.relpath(os.path.abspath(path), _MEDIA_ROOT)
+        # 미디어 디렉토리 밖의 파일은 앱에서 직접 전송
+        if not relative.startswith(os.pardir):
+            return Response(
+                media_type=media_type,
+                headers={
+                    "X-Accel-Redirect": settings.MEDIA_URL + quote(relative.replace(os.sep, "/")),
+                    "Content-Disposition": _content_disposition(filename),
+                }
+            )
+
+    return FileResponse(path=path, filename=filename, media_type=media_type)
@@ -1,14 +1,105 @@
 """로깅 설정"""
 import logging
 import sys
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from queue import SimpleQueue
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+)
 from .config import settings
 
+# 버퍼 핸들러 설정 (64KB 버퍼, 30초마다 기록)
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 30.0
+
+
+class BufferedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """레코드를 메모리 버퍼에 모아 주기적으로 기록하는 일별 로테이션 핸들러 (ERROR 이상은 즉시 기록)"""
+    
+    def __init__(self, *args, buffer_size: int = LOG_BUFFER_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, **kwargs):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._flush_timer = None
+        self._closed = False
+        super().__init__(*args, **kwargs)
+        self._schedule_flush()
+    
+    def _open(self):
+        return open(
+            self.baseFilename, self.mode, buffering=self.buffer_size,
+            encoding=self.encoding, errors=self.errors
+        )
+    
+    def emit(self, record: logging.LogRecord):
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self.flush_buffer()
+    
+    def flush(self):
+        """레코드마다 호출되는 flush는 건너뜀 (flush_buffer로만 기록)"""
+    
+    def flush_buffer(self):
+        """버퍼 내용을 파일에 기록"""
+        super().flush()
+    
+    def _schedule_flush(self):
+        if self._closed:
+            return
+        self._flush_timer = threading.Timer(self.flush_interval, self._periodic_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def _periodic_flush(self):
+        self.flush_buffer()
+        self._schedule_flush()
+    
+    def close(self):
+        self._closed = True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self.flush_buffer()
+        super().close()
+
+
+# 로거별 큐 리스너 (실제 파일/콘솔 쓰기는 리스너 스레드에서 수행)
+_listeners: list[QueueListener] = []
+_listeners_started = False
+
+
+def _attach_queue(logger: logging.Logger, *handlers: logging.Handler):
+    """로거에는 QueueHandler만 붙이고 실제 핸들러는 큐 리스너로 이동"""
+    log_queue = SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listeners.append(QueueListener(log_queue, *handlers, respect_handler_level=True))
+
+
+def start_log_listeners():
+    """큐 리스너 시작 (애플리케이션 시작 시)"""
+    global _listeners_started
+    if _listeners_started:
+        return
+    for listener in _listeners:
+        listener.start()
+    _listeners_started = True
+
+
+def stop_log_listeners():
+    """큐 리스너 중지 및 남은 로그 기록 (애플리케이션 종료 시)"""
+    global _listeners_started
+    if not _listeners_started:
+        return
+    for listener in _listeners:
+        listener.stop()
+    _listeners_started = False
+
 
 def setup_logging():
     """로깅 설정 초기화"""
     
+    debug = settings.DEBUG
+    
     # 로그 디렉토리 생성
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
@@ -26,16 +117,15 @@ def setup_logging():
     
     # 루트 로거
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO if not settings.DEBUG else logging.DEBUG)
+    root_logger.setLevel(logging.INFO if not debug else logging.DEBUG)
     
     # 콘솔 핸들러
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(log_format)
-    root_logger.addHandler(console_handler)
     
-    # 파일 핸들러 - 일반 로그 (일별 로테이션)
-    file_handler = TimedRotatingFileHandler(
+    # 파일 핸들러 - 일반 로그 (일별 로테이션, 버퍼링)
+    file_handler = BufferedTimedRotatingFileHandler(
         filename=log_dir / "app.log",
         when="midnight",
         interval=1,
@@ -44,9 +134,8 @@ def setup_logging():
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(detailed_format)
-    root_logger.addHandler(file_handler)
     
-    # 파일 핸들러 - 에러 로그 (크기 기반 로테이션)
+    # 파일 핸들러 - 에러 로그 (크기 기반 로테이션, 버퍼링 없이 바로 기록)
     error_handler = RotatingFileHandler(
         filename=log_dir / "error.log",
         maxBytes=10 * 1024 * 1024,  # 10MB
@@ -55,11 +144,13 @@ def setup_logging():
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_format)
-    root_logger.addHandler(error_handler)
+    
+    # 루트 로거 핸들러는 큐를 통해 별도 스레드에서 기록 (이벤트 루프가 파일 I/O로 멈추지 않도록)
+    _attach_queue(root_logger, console_handler, file_handler, error_handler)
     
     # Celery 로거
     celery_logger = logging.getLogger("celery")
-    celery_handler = TimedRotatingFileHandler(
+    celery_handler = BufferedTimedRotatingFileHandler(
         filename=log_dir / "celery.log",
         when="midnight",
         interval=1,
@@ -67,16 +158,16 @@ def setup_logging():
         encoding="utf-8"
     )
     celery_handler.setFormatter(detailed_format)
-    celery_logger.addHandler(celery_handler)
+    _attach_queue(celery_logger, celery_handler)
     
     # SQLAlchemy 로거 (프로덕션에서는 WARNING만)
     sqlalchemy_logger = logging.getLogger("sqlalchemy.engine")
-    sqlalchemy_logger.setLevel(logging.WARNING if not settings.DEBUG else logging.INFO)
+    sqlalchemy_logger.setLevel(logging.WARNING if not debug else logging.INFO)
     
     # Uvicorn 로거
     uvicorn_access = logging.getLogger("uvicorn.access")
     uvicorn_access.handlers = []  # 기본 핸들러 제거
-    access_handler = TimedRotatingFileHandler(
+    access_handler = BufferedTimedRotatingFileHandler(
         filename=log_dir / "access.log",
         when="midnight",
         interval=1,
@@ -84,7 +175,7 @@ def setup_logging():
         encoding="utf-8"
     )
     access_handler.setFormatter(log_format)
-    uvicorn_access.addHandler(access_handler)
+    _attach_queue(uvicorn_access, access_handler)
     
     logging.info("로깅 시스템 초기화 완료")
     logging.info(f"로그 디렉토리: {log_dir.absolute()}")
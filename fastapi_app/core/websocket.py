@@ -1,8 +1,9 @@
 """WebSocket 연결 관리자"""
 from fastapi import WebSocket
-from typing import Dict, List
-import json
+from typing import Dict, Set
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -11,54 +12,73 @@ class ConnectionManager:
     """WebSocket 연결 관리"""
     
     def __init__(self):
-        # user_id -> List[WebSocket]
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+        # user_id -> Set[WebSocket]
+        self.active_connections: Dict[int, Set[WebSocket]] = {}
     
     async def connect(self, websocket: WebSocket, user_id: int):
         """클라이언트 연결"""
         await websocket.accept()
         
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        
-        self.active_connections[user_id].append(websocket)
+        self.active_connections.setdefault(user_id, set()).add(websocket)
         logger.info(f"WebSocket 연결: user_id={user_id}, 총 연결 수={len(self.active_connections[user_id])}")
     
     def disconnect(self, websocket: WebSocket, user_id: int):
         """클라이언트 연결 해제"""
-        if user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
+        conns = self.active_connections.get(user_id)
+        if conns is not None:
+            if websocket in conns:
+                conns.discard(websocket)
                 logger.info(f"WebSocket 연결 해제: user_id={user_id}")
             
             # 연결이 없으면 딕셔너리에서 제거
-            if not self.active_connections[user_id]:
+            if not conns:
                 del self.active_connections[user_id]
     
     async def send_personal_message(self, message: dict, user_id: int):
         """특정 사용자에게 메시지 전송"""
-        if user_id in self.active_connections:
-            disconnected = []
-            
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"메시지 전송 실패: {e}")
-                    disconnected.append(connection)
-            
-            # 연결 끊긴 것들 제거
-            for conn in disconnected:
-                self.disconnect(conn, user_id)
+        await self._send_serialized(orjson.dumps(message).decode(), user_id)
+    
+    async def _send_serialized(self, payload: str, user_id: int):
+        """이미 직렬화된 JSON 텍스트를 특정 사용자에게 전송"""
+        conns = self.active_connections.get(user_id)
+        if not conns:
+            return
+        
+        # 전송 중 집합이 바뀔 수 있으므로 스냅샷으로 동시 전송
+        snapshot = tuple(conns)
+        results = await asyncio.gather(
+            *[connection.send_text(payload) for connection in snapshot],
+            return_exceptions=True
+        )
+        
+        dead = set()
+        for connection, result in zip(snapshot, results):
+            if isinstance(result, Exception):
+                logger.error(f"메시지 전송 실패: {result}")
+                dead.add(connection)
+        
+        if not dead:
+            return
+        
+        # 연결 끊긴 것들 한 번에 제거 (전송 중 바뀐 현재 집합 기준)
+        remaining = self.active_connections.get(user_id, set()) - dead
+        if remaining:
+            self.active_connections[user_id] = remaining
+        else:
+            self.active_connections.pop(user_id, None)
     
     async def broadcast(self, message: dict):
         """모든 연결된 클라이언트에게 메시지 전송"""
-        for user_id, connections in self.active_connections.items():
-            await self.send_personal_message(message, user_id)
+        # 한 번만 직렬화해서 모든 연결에 재사용
+        payload = orjson.dumps(message).decode()
+        await asyncio.gather(*[
+            self._send_serialized(payload, user_id)
+            for user_id in list(self.active_connections)
+        ])
     
     def get_connection_count(self, user_id: int) -> int:
         """사용자의 연결 수"""
-        return len(self.active_connections.get(user_id, []))
+        return len(self.active_connections.get(user_id, ()))
     
     def get_total_connections(self) -> int:
         """전체 연결 수"""
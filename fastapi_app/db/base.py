@@ -1,6 +1,10 @@
-# Database Base - import all models here for Alembic
+# Database Base - 테이블 생성/마이그레이션 시 load_all_models()로 전체 모델 등록
 from .session import Base
-from ..models.user import User
-from ..models.document import Document, ExtractedData, Report
 
-__all__ = ["Base", "User", "Document", "ExtractedData", "Report"]
+
+def load_all_models():
+    """모든 모델을 임포트해 Base.metadata에 테이블 등록 (create_all/Alembic 전에 호출)"""
+    from ..models import user, document  # noqa: F401
+
+
+__all__ = ["Base", "load_all_models"]
@@ -1,15 +1,48 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
 
+_is_sqlite = "sqlite" in settings.DATABASE_URL
+
+# 커넥션 풀 설정 (동시 요청이 몰려도 풀 한도에서 멈추지 않도록)
+_pool_kwargs = {} if _is_sqlite else {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": True,
+    "pool_use_lifo": True,  # 최근 쓴 커넥션부터 재사용 (유휴 커넥션은 자연스럽게 정리)
+}
+
+# psycopg2: 일괄 UPDATE/DELETE(executemany)를 execute_batch로 묶어 왕복 횟수 감소
+_dialect_kwargs = {}
+if make_url(settings.DATABASE_URL).get_driver_name() == "psycopg2":
+    _dialect_kwargs = {
+        "executemany_mode": "values_plus_batch",
+        "executemany_batch_page_size": 500,
+    }
+
 # SQLAlchemy 엔진 생성
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    echo=settings.DEBUG,
+    **_pool_kwargs,
+    **_dialect_kwargs
 )
 
+# SQLite 연결 설정
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn, _connection_record):
+        """WAL 저널 + synchronous=NORMAL (커밋마다 fsync하지 않도록)"""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cursor.close()
+
 # 세션 팩토리
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -7,10 +7,9 @@ import logging
 
 from .api import users, documents, auth, websocket, merge
 from .core.config import settings
-from .core.logging_config import setup_logging
+from .core.logging_config import setup_logging, start_log_listeners, stop_log_listeners
 from .core.exception_handlers import register_exception_handlers
 from .db.session import engine
-from .db.base import Base
 
 # 로깅 설정
 setup_logging()
@@ -21,12 +20,14 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """애플리케이션 시작/종료 시 실행"""
     # 시작 시
+    start_log_listeners()
     logger.info("🚀 FastAPI 애플리케이션 시작")
     logger.info(f"환경: {'개발' if settings.DEBUG else '프로덕션'}")
     logger.info(f"데이터베이스: {settings.DATABASE_URL}")
     yield
     # 종료 시
     logger.info("👋 FastAPI 애플리케이션 종료")
+    stop_log_listeners()
 
 
 app = FastAPI(
@@ -41,19 +42,24 @@ app = FastAPI(
 # 예외 핸들러 등록
 register_exception_handlers(app)
 
-# CORS 설정
+# CORS 설정 (허용 메서드/헤더를 고정해 요청 헤더를 매번 되돌려 주지 않도록)
+CORS_ORIGINS = tuple(settings.CORS_ORIGINS)
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+CORS_ALLOW_HEADERS = ("Authorization", "Content-Type")
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
 )
-logger.info(f"CORS 설정: {settings.CORS_ORIGINS}")
+logger.info(f"CORS 설정: {CORS_ORIGINS}")
 
-# 미디어 파일 서빙
-os.makedirs("media", exist_ok=True)
-app.mount("/media", StaticFiles(directory="media"), name="media")
+# 미디어 파일 서빙 (Nginx가 X-Accel-Redirect로 서빙하도록 설정하지 않은 경우)
+if not settings.USE_X_ACCEL_REDIRECT:
+    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+    app.mount(settings.MEDIA_URL.rstrip("/"), StaticFiles(directory=settings.MEDIA_ROOT), name="media")
 
 
 # 라우터 등록
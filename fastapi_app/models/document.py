@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Enum as SQLEnum
+from sqlalchemy import (
+    Boolean, Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, Enum as SQLEnum, text
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..db.session import Base
@@ -9,6 +11,13 @@ import enum
 class Document(Base):
     """문서 모델"""
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_user_id_id", "user_id", "id"),
+        # 목록/통계 조회: user_id + status 필터, created_at 정렬 (역방향 인덱스 스캔)
+        Index("ix_documents_user_status_created", "user_id", "status", "created_at"),
+        # 상태 필터 없는 목록 조회: user_id + created_at 정렬
+        Index("ix_documents_user_created", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -49,6 +58,10 @@ class ExtractedData(Base):
 class Report(Base):
     """리포트 모델"""
     __tablename__ = "reports"
+    __table_args__ = (
+        # 문서별 리포트 목록 (최신순)
+        Index("ix_reports_document_id_id", "document_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
@@ -67,6 +80,10 @@ class Report(Base):
 class MergeProject(Base):
     """파일 병합 프로젝트 모델"""
     __tablename__ = "merge_projects"
+    __table_args__ = (
+        Index("ix_merge_projects_user_id_id", "user_id", "id"),
+        Index("ix_merge_projects_user_status_created", "user_id", "status", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -96,6 +113,10 @@ class MergeProject(Base):
 class MergeFile(Base):
     """병합 대상 파일 모델"""
     __tablename__ = "merge_files"
+    __table_args__ = (
+        # 프로젝트별 파일 조회 / 분석 여부 필터
+        Index("ix_merge_files_project_analyzed", "project_id", "is_analyzed"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("merge_projects.id"), nullable=False)
@@ -110,8 +131,8 @@ class MergeFile(Base):
     column_types = Column(JSON, default=dict)
     sample_data = Column(JSON, default=list)
     
-    is_analyzed = Column(Integer, default=0)  # SQLite boolean
-    is_processed = Column(Integer, default=0)
+    is_analyzed = Column(Boolean, default=False, nullable=False)
+    is_processed = Column(Boolean, default=False, nullable=False)
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -122,9 +143,18 @@ class MergeFile(Base):
 class ColumnMappingTemplate(Base):
     """매핑 템플릿 모델"""
     __tablename__ = "column_mapping_templates"
+    __table_args__ = (
+        # 공개 템플릿만 담는 부분 인덱스
+        Index(
+            "ix_column_mapping_templates_public", "id",
+            postgresql_where=text("is_public"),
+            sqlite_where=text("is_public"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # user_id 인덱스 + 공개 부분 인덱스로 "user_id = ? OR is_public" 조회를 BitmapOr로 처리
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, default="")
     
@@ -133,7 +163,7 @@ class ColumnMappingTemplate(Base):
     number_columns = Column(JSON, default=list)
     date_output_format = Column(String(50), default="%Y-%m-%d")
     custom_aliases = Column(JSON, default=dict)
-    is_public = Column(Integer, default=0)  # SQLite boolean
+    is_public = Column(Boolean, default=False, nullable=False)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
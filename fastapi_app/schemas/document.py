@@ -102,6 +102,12 @@ class ReportResponse(ReportBase):
         from_attributes = True
 
 
+class ReportList(BaseModel):
+    """리포트 목록 응답"""
+    total: int
+    reports: List[ReportResponse]
+
+
 # 파일 업로드 응답
 class UploadResponse(BaseModel):
     """파일 업로드 응답"""
@@ -145,6 +151,12 @@ class MergeFileResponse(BaseModel):
         from_attributes = True
 
 
+class MergeFileList(BaseModel):
+    """병합 파일 목록"""
+    total: int
+    files: List[MergeFileResponse]
+
+
 class MergeProjectCreate(BaseModel):
     """병합 프로젝트 생성"""
     name: str = Field(..., min_length=1, max_length=255)
@@ -218,3 +230,9 @@ class MappingTemplateResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class MappingTemplateList(BaseModel):
+    """매핑 템플릿 목록"""
+    total: int
+    templates: List[MappingTemplateResponse]
@@ -1,5 +1,7 @@
 from celery import Celery
+from celery.signals import worker_process_init
 from ..core.config import settings
+from ..db.session import engine
 
 celery_app = Celery(
     "fastapi_document_processor",
@@ -15,5 +17,12 @@ celery_app.conf.update(
     enable_utc=True,
 )
 
+
+@worker_process_init.connect
+def _reset_db_pool(**kwargs):
+    """prefork 워커 프로세스마다 커넥션 풀 새로 시작 (부모 프로세스의 커넥션 공유 방지)"""
+    engine.dispose(close=False)
+
+
 # 태스크 import (Celery가 태스크를 찾도록)
 from . import document_tasks  # noqa
@@ -1,16 +1,46 @@
 from celery import shared_task
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.sql import func
 from datetime import datetime
+import io
 import os
+import sys
 import logging
+from pathlib import Path
 
 from .celery_app import celery_app
 from ..db.session import SessionLocal
 from ..models.document import Document, ExtractedData, Report, MergeProject, MergeFile
 from ..schemas.document import DocumentStatus, FileType
 
+# documents 앱의 유틸리티 재사용 (프로젝트 루트는 임포트 시 한 번만 계산해 경로에 추가)
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+_MERGED_DIR = os.path.join(_PROJECT_ROOT, 'media', 'merged')
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
+
+from documents.utils.merge_service import MergeService  # noqa: E402
+from documents.utils.normalizers import DateNormalizer  # noqa: E402
+
 logger = logging.getLogger(__name__)
 
+# pypdfium2는 선택 의존성 — 없으면 PyPDF2로 처리
+try:
+    import pypdfium2 as pdfium
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
+
+# ON CONFLICT DO UPDATE를 지원하는 DB별 insert
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
 
 def get_db():
     """데이터베이스 세션"""
@@ -27,13 +57,27 @@ def process_document_task(self, document_id: int):
     db = SessionLocal()
     
     try:
-        document = db.query(Document).filter(Document.id == document_id).first()
+        # 처리 대기 중인 문서를 행 잠금으로 선점 (같은 태스크가 중복 전달되면 다른 워커는 건너뜀)
+        # 재시도 시에는 FAILED 상태이므로 함께 허용, SQLite는 FOR UPDATE를 무시하고 상태 조건만 적용
+        document = db.execute(
+            select(Document.file_type, Document.file_path, Document.original_filename)
+            .where(
+                Document.id == document_id,
+                Document.status.in_((DocumentStatus.PENDING, DocumentStatus.FAILED))
+            )
+            .with_for_update(skip_locked=True)
+        ).first()
         if not document:
-            logger.error(f"문서를 찾을 수 없습니다: {document_id}")
-            return {"status": "error", "message": "문서를 찾을 수 없습니다"}
-        
-        # 상태 업데이트
-        document.status = DocumentStatus.PROCESSING
+            db.rollback()
+            logger.info(f"처리할 문서가 없거나 이미 처리 중입니다: {document_id}")
+            return {"status": "skipped", "document_id": document_id}
+        
+        # 잠금을 쥔 채로 상태를 바꾸고 커밋해서 잠금 해제
+        db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(status=DocumentStatus.PROCESSING)
+        )
         db.commit()
         
         # 파일 유형에 따라 처리
@@ -46,33 +90,34 @@ def process_document_task(self, document_id: int):
         else:
             raise ValueError(f"지원하지 않는 파일 유형: {document.file_type}")
         
-        # 추출된 데이터 저장
-        extracted_data = db.query(ExtractedData).filter(
-            ExtractedData.document_id == document_id
-        ).first()
-        
-        if extracted_data:
-            for key, value in result.items():
-                setattr(extracted_data, key, value)
-        else:
-            extracted_data = ExtractedData(document_id=document_id, **result)
-            db.add(extracted_data)
-        
-        # 문서 상태 업데이트
-        document.status = DocumentStatus.COMPLETED
-        document.processed_at = datetime.now()
+        # 추출된 데이터 저장 + 문서 상태 업데이트 (한 번에 커밋)
+        save_extracted_data(db, document_id, result)
+        db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(status=DocumentStatus.COMPLETED, processed_at=datetime.now())
+        )
         db.commit()
         
-        # 리포트 생성
-        generate_report_task.delay(document_id)
+        # 리포트 생성 (브로커를 거치지 않고 같은 세션으로 바로 생성, 실패 시에만 태스크로 재시도)
+        try:
+            _create_reports(db, [document_id])
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"리포트 생성 실패, 태스크로 재시도: {str(e)}")
+            generate_report_task.delay(document_id)
         
         logger.info(f"문서 처리 완료: {document.original_filename}")
         return {"status": "success", "document_id": document_id}
         
     except Exception as e:
         logger.error(f"문서 처리 오류: {str(e)}")
-        document.status = DocumentStatus.FAILED
-        document.error_message = str(e)
+        db.rollback()
+        db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(status=DocumentStatus.FAILED, error_message=str(e))
+        )
         db.commit()
         raise self.retry(exc=e, countdown=60)
     
@@ -80,20 +125,55 @@ def process_document_task(self, document_id: int):
         db.close()
 
 
+def save_extracted_data(db: Session, document_id: int, result: dict):
+    """추출 데이터 저장 (document_id 기준 upsert, 조회 없이 한 문장으로 처리)"""
+    upsert_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert_insert is None:
+        # ON CONFLICT를 지원하지 않는 DB는 조회 후 수정
+        extracted_data = db.query(ExtractedData).filter(
+            ExtractedData.document_id == document_id
+        ).first()
+        
+        if extracted_data:
+            for key, value in result.items():
+                setattr(extracted_data, key, value)
+        else:
+            db.add(ExtractedData(document_id=document_id, **result))
+        return
+    
+    stmt = upsert_insert(ExtractedData).values(document_id=document_id, **result)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExtractedData.document_id],
+        set_={**result, 'updated_at': func.now()},
+    )
+    db.execute(stmt)
+
+
 def process_excel(file_path: str) -> dict:
     """엑셀 파일 처리"""
     try:
         import openpyxl
         
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
-        
-        data = []
-        for row in sheet.iter_rows(values_only=True):
-            data.append(list(row))
-        
-        headers = data[0] if data else []
-        rows = data[1:] if len(data) > 1 else []
+        # 읽기 전용 모드: 전체 셀 객체를 만들지 않고 행 단위로 스트리밍
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            sheet = wb.active
+            sheet_names = wb.sheetnames
+            
+            # 한 번만 순회하면서 헤더/행 분리와 텍스트(탭 구분) 생성을 함께 처리
+            # openpyxl이 돌려주는 튜플을 그대로 보관 (JSON 컬럼에는 리스트로 저장됨)
+            headers = ()
+            rows = []
+            text_buffer = io.StringIO()
+            for index, row in enumerate(sheet.iter_rows(values_only=True)):
+                if index == 0:
+                    headers = row
+                else:
+                    rows.append(row)
+                text_buffer.write('\t'.join('' if value is None else str(value) for value in row))
+                text_buffer.write('\n')
+        finally:
+            wb.close()
         
         structured_data = {
             'headers': headers,
@@ -102,12 +182,12 @@ def process_excel(file_path: str) -> dict:
         }
         
         return {
-            'extracted_text': str(data),
+            'extracted_text': text_buffer.getvalue(),
             'structured_data': structured_data,
             'total_rows': len(rows),
             'meta_info': {  # metadata -> meta_info로 변경
-                'sheet_count': len(wb.sheetnames),
-                'sheet_names': wb.sheetnames,
+                'sheet_count': len(sheet_names),
+                'sheet_names': sheet_names,
             }
         }
     except Exception as e:
@@ -120,15 +200,15 @@ def process_image(file_path: str) -> dict:
     try:
         from PIL import Image
         
-        img = Image.open(file_path)
-        
-        metadata_dict = {
-            'format': img.format,
-            'mode': img.mode,
-            'size': img.size,
-            'width': img.width,
-            'height': img.height,
-        }
+        # 헤더만 읽어 메타데이터 추출 (픽셀 디코딩 없음), 파일은 바로 닫음
+        with Image.open(file_path) as img:
+            metadata_dict = {
+                'format': img.format,
+                'mode': img.mode,
+                'size': img.size,
+                'width': img.width,
+                'height': img.height,
+            }
         
         return {
             'extracted_text': '',
@@ -143,20 +223,24 @@ def process_image(file_path: str) -> dict:
 def process_pdf(file_path: str) -> dict:
     """PDF 파일 처리"""
     try:
-        from PyPDF2 import PdfReader
-        
-        reader = PdfReader(file_path)
+        if HAS_PDFIUM:
+            text_parts, total_pages = _extract_pdf_text_pdfium(file_path)
+        else:
+            from PyPDF2 import PdfReader
+            
+            reader = PdfReader(file_path)
+            text_parts = [page.extract_text() for page in reader.pages]
+            total_pages = len(reader.pages)
         
-        text = ''
-        for page in reader.pages:
-            text += page.extract_text() + '\n'
+        # 페이지마다 문자열을 이어 붙이지 않고 한 번에 결합
+        text = ''.join(part + '\n' for part in text_parts)
         
         return {
             'extracted_text': text,
             'structured_data': {},
-            'total_pages': len(reader.pages),
+            'total_pages': total_pages,
             'meta_info': {  # metadata -> meta_info로 변경
-                'page_count': len(reader.pages),
+                'page_count': total_pages,
             }
         }
     except Exception as e:
@@ -164,27 +248,41 @@ def process_pdf(file_path: str) -> dict:
         raise
 
 
-@celery_app.task
-def generate_report_task(document_id: int):
-    """리포트 생성 태스크"""
-    db = SessionLocal()
-    
+def _extract_pdf_text_pdfium(file_path: str) -> tuple[list[str], int]:
+    """PDFium으로 페이지별 텍스트 추출"""
+    # PDFium은 스레드 안전하지 않고 Celery prefork 워커 안에서는 하위 프로세스를 만들 수 없으므로
+    # 페이지는 순서대로 추출 (병렬 처리는 워커 동시성으로 문서 단위로 수행)
+    pdf = pdfium.PdfDocument(file_path)
     try:
-        document = db.query(Document).filter(Document.id == document_id).first()
-        if not document:
-            return
-        
-        extracted_data = db.query(ExtractedData).filter(
-            ExtractedData.document_id == document_id
-        ).first()
-        
-        if not extracted_data:
-            return
-        
-        # 리포트 생성
-        title = f"{document.original_filename} 분석 리포트"
-        summary = generate_summary(extracted_data)
-        
+        text_parts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            text_parts.append(textpage.get_text_bounded())
+            textpage.close()
+            page.close()
+        return text_parts, len(pdf)
+    finally:
+        pdf.close()
+
+
+def _create_reports(db: Session, document_ids: list[int]) -> list[int]:
+    """문서들의 리포트를 한 번의 조회와 한 번의 INSERT로 생성"""
+    # 추출 텍스트 본문은 가져오지 않고 길이만 DB에서 계산
+    pairs = db.query(
+        Document,
+        ExtractedData.total_pages,
+        ExtractedData.total_rows,
+        ExtractedData.structured_data,
+        func.coalesce(func.length(ExtractedData.extracted_text), 0).label('text_length'),
+    ).join(
+        ExtractedData, ExtractedData.document_id == Document.id
+    ).filter(Document.id.in_(document_ids)).all()
+    
+    if not pairs:
+        return []
+    
+    rows = []
+    for document, total_pages, total_rows, structured_data, text_length in pairs:
         content = {
             'file_info': {
                 'filename': document.original_filename,
@@ -193,25 +291,43 @@ def generate_report_task(document_id: int):
                 'processed_at': document.processed_at.isoformat() if document.processed_at else None,
             },
             'extracted_data': {
-                'total_pages': extracted_data.total_pages,
-                'total_rows': extracted_data.total_rows,
-                'text_length': len(extracted_data.extracted_text),
+                'total_pages': total_pages,
+                'total_rows': total_rows,
+                'text_length': text_length,
             },
-            'structured_data': extracted_data.structured_data,
+            'structured_data': structured_data,
         }
         
-        report = Report(
-            document_id=document_id,
-            title=title,
-            summary=summary,
-            content=content,
-            generated_by=document.user_id,
-        )
-        
-        db.add(report)
-        db.commit()
-        
+        rows.append({
+            'document_id': document.id,
+            'title': f"{document.original_filename} 분석 리포트",
+            'summary': generate_summary(total_pages, total_rows, text_length),
+            'content': content,
+            'generated_by': document.user_id,
+        })
+    
+    report_ids = db.scalars(insert(Report).returning(Report.id), rows).all()
+    db.commit()
+    
+    for document, *_ in pairs:
         logger.info(f"리포트 생성 완료: {document.original_filename}")
+    
+    return report_ids
+
+
+@celery_app.task
+def generate_report_task(document_id: int):
+    """리포트 생성 태스크 (문서 처리 중 인라인 생성이 실패했을 때 재시도용)"""
+    return generate_reports_batch_task(document_ids=[document_id])
+
+
+@celery_app.task
+def generate_reports_batch_task(document_ids: list[int]):
+    """여러 문서의 리포트 일괄 생성 태스크"""
+    db = SessionLocal()
+    
+    try:
+        return _create_reports(db, document_ids)
         
     except Exception as e:
         logger.error(f"리포트 생성 오류: {str(e)}")
@@ -221,17 +337,16 @@ def generate_report_task(document_id: int):
         db.close()
 
 
-def generate_summary(extracted_data: ExtractedData) -> str:
+def generate_summary(total_pages: int, total_rows: int, text_length: int) -> str:
     """요약 생성"""
     summary_parts = []
     
-    if extracted_data.total_pages > 0:
-        summary_parts.append(f"총 {extracted_data.total_pages}페이지")
+    if total_pages > 0:
+        summary_parts.append(f"총 {total_pages}페이지")
     
-    if extracted_data.total_rows > 0:
-        summary_parts.append(f"총 {extracted_data.total_rows}행의 데이터")
+    if total_rows > 0:
+        summary_parts.append(f"총 {total_rows}행의 데이터")
     
-    text_length = len(extracted_data.extracted_text)
     if text_length > 0:
         summary_parts.append(f"{text_length:,}자의 텍스트 추출됨")
     
@@ -242,45 +357,63 @@ def generate_summary(extracted_data: ExtractedData) -> str:
 # 파일 병합 태스크
 # ========================
 
+def _index_file_ids_by_name(merge_files: list[MergeFile]) -> dict[str, int]:
+    """원본 파일명 -> MergeFile ID (같은 이름이면 먼저 나온 파일)"""
+    file_ids_by_name = {}
+    for mf in merge_files:
+        file_ids_by_name.setdefault(mf.original_filename, mf.id)
+    return file_ids_by_name
+
+
 @celery_app.task(bind=True, max_retries=2)
 def analyze_merge_files_task(self, project_id: int):
     """병합 프로젝트 파일 분석 태스크"""
     db = SessionLocal()
     
     try:
-        project = db.query(MergeProject).filter(MergeProject.id == project_id).first()
+        project = db.get(MergeProject, project_id)
         if not project:
             logger.error(f"병합 프로젝트를 찾을 수 없음: {project_id}")
             return {"status": "error"}
         
-        project.status = "analyzing"
-        db.commit()
-        
-        # documents 앱의 유틸리티 재사용
-        import sys
-        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        from documents.utils.merge_service import MergeService
-        
+        # 첫 실행의 analyzing 상태는 API에서 태스크 등록 전에 이미 커밋됨
+        # 재시도는 실패 처리로 failed가 된 뒤 실행되므로 다시 analyzing으로 표시 (업로드/병합과 동시 실행 방지)
+        if self.request.retries > 0:
+            project.status = "analyzing"
+            db.commit()
+
         service = MergeService()
-        merge_files = db.query(MergeFile).filter(MergeFile.project_id == project_id).all()
+        # 결과 JSON 컬럼(sample_data 등)은 쓰지 않으므로 필요한 컬럼만 로드
+        merge_files = db.query(MergeFile).options(
+            load_only(MergeFile.id, MergeFile.file_path, MergeFile.original_filename)
+        ).filter(MergeFile.project_id == project_id).all()
         file_paths = [mf.file_path for mf in merge_files]
+        file_ids_by_name = _index_file_ids_by_name(merge_files)
         
         analysis = service.analyze_files(file_paths)
         
         # 개별 파일 결과 저장
+        file_updates = []
         for file_info in analysis.get('files', []):
-            for mf in merge_files:
-                if mf.original_filename == file_info.get('filename'):
-                    if 'error' not in file_info:
-                        mf.detected_headers = file_info.get('headers', [])
-                        mf.header_row_index = file_info.get('header_row_index', 0)
-                        mf.total_rows = file_info.get('total_rows', 0)
-                        mf.column_types = file_info.get('column_types', {})
-                        mf.sample_data = file_info.get('sample_data', [])
-                        mf.is_analyzed = 1
-                    else:
-                        mf.error_message = file_info['error']
-                    break
+            file_id = file_ids_by_name.get(file_info.get('filename'))
+            if file_id is None:
+                continue
+            if 'error' not in file_info:
+                file_updates.append({
+                    'id': file_id,
+                    'detected_headers': file_info.get('headers', []),
+                    'header_row_index': file_info.get('header_row_index', 0),
+                    'total_rows': file_info.get('total_rows', 0),
+                    'column_types': file_info.get('column_types', {}),
+                    'sample_data': file_info.get('sample_data', []),
+                    'is_analyzed': True,
+                })
+            else:
+                file_updates.append({'id': file_id, 'error_message': file_info['error']})
+        
+        # 기본 키 기준 일괄 UPDATE
+        if file_updates:
+            db.execute(update(MergeFile), file_updates)
         
         project.analysis_result = {
             'suggested_mappings': analysis.get('suggested_mappings', {}),
@@ -312,7 +445,7 @@ def execute_merge_task(self, project_id: int):
     db = SessionLocal()
     
     try:
-        project = db.query(MergeProject).filter(MergeProject.id == project_id).first()
+        project = db.get(MergeProject, project_id)
         if not project:
             return {"status": "error"}
         
@@ -320,30 +453,31 @@ def execute_merge_task(self, project_id: int):
         project.error_message = None
         db.commit()
         
-        import sys
-        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        from documents.utils.merge_service import MergeService
-        from documents.utils.normalizers import DateNormalizer
-        
         service = MergeService()
         
         if project.date_output_format:
             service.date_normalizer = DateNormalizer(output_format=project.date_output_format)
         
         if project.column_mapping:
+            # 원본 열 -> 표준 열 매핑을 표준 열 기준으로 묶어 한 번에 추가
+            grouped_mapping = {}
             for original, standard in project.column_mapping.items():
-                service.column_mapper.add_mapping(standard, [original])
+                grouped_mapping.setdefault(standard, []).append(original)
+            service.column_mapper.bulk_add(grouped_mapping)
         
-        merge_files = db.query(MergeFile).filter(MergeFile.project_id == project_id).all()
+        # 결과 JSON 컬럼(sample_data 등)은 쓰지 않으므로 필요한 컬럼만 로드
+        merge_files = db.query(MergeFile).options(
+            load_only(MergeFile.id, MergeFile.file_path, MergeFile.original_filename)
+        ).filter(MergeFile.project_id == project_id).all()
         file_paths = [mf.file_path for mf in merge_files]
+        file_ids_by_name = _index_file_ids_by_name(merge_files)
         
-        output_dir = os.path.join(
-            str(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-            'media', 'merged', datetime.now().strftime('%Y/%m/%d')
-        )
+        # 디렉토리, 파일명, 완료 시각이 같은 시각을 쓰도록 한 번만 조회
+        now = datetime.now()
+        output_dir = os.path.join(_MERGED_DIR, now.strftime('%Y/%m/%d'))
         os.makedirs(output_dir, exist_ok=True)
         
-        output_filename = f'merged_{project_id}_{datetime.now().strftime("%H%M%S")}.xlsx'
+        output_filename = f'merged_{project_id}_{now.strftime("%H%M%S")}.xlsx'
         output_path = os.path.join(output_dir, output_filename)
         
         result = service.merge_files(
@@ -359,15 +493,21 @@ def execute_merge_task(self, project_id: int):
             project.merged_file_path = output_path
             project.merge_log = result
             project.status = "completed"
-            project.completed_at = datetime.now()
+            project.completed_at = now
             
+            file_updates = []
             for log_entry in result.get('merge_log', []):
-                for mf in merge_files:
-                    if mf.original_filename == log_entry.get('file'):
-                        mf.is_processed = 1 if log_entry.get('status') == 'success' else 0
-                        if log_entry.get('error'):
-                            mf.error_message = log_entry['error']
-                        break
+                file_id = file_ids_by_name.get(log_entry.get('file'))
+                if file_id is None:
+                    continue
+                file_update = {'id': file_id, 'is_processed': log_entry.get('status') == 'success'}
+                if log_entry.get('error'):
+                    file_update['error_message'] = log_entry['error']
+                file_updates.append(file_update)
+            
+            # 기본 키 기준 일괄 UPDATE
+            if file_updates:
+                db.execute(update(MergeFile), file_updates)
         else:
             project.status = "failed"
             project.error_message = result.get('error', '병합 실패')
@@ -6,13 +6,60 @@ from pathlib import Path
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.append(str(Path(__file__).parent))
 
+from sqlalchemy import text
+
 from fastapi_app.db.session import engine
-from fastapi_app.db.base import Base
+from fastapi_app.db.base import Base, load_all_models
+
+# Integer에서 Boolean으로 바뀐 플래그 컬럼 (기존 PostgreSQL DB 변환 대상)
+BOOLEAN_FLAG_COLUMNS = (
+    ("merge_files", "is_analyzed"),
+    ("merge_files", "is_processed"),
+    ("column_mapping_templates", "is_public"),
+)
+
+
+def upgrade_boolean_flags(conn):
+    """기존 PostgreSQL DB의 integer 플래그 컬럼을 boolean으로 변환 (이미 boolean이면 건너뜀)"""
+    for table, column in BOOLEAN_FLAG_COLUMNS:
+        data_type = conn.execute(
+            text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_schema = current_schema() "
+                "AND table_name = :table AND column_name = :column"
+            ),
+            {"table": table, "column": column}
+        ).scalar()
+        if data_type is None or data_type == "boolean":
+            continue
+        
+        print(f"🔧 {table}.{column}: {data_type} → boolean")
+        conn.execute(text(
+            f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT, "
+            f"ALTER COLUMN {column} TYPE boolean USING COALESCE({column}, 0) <> 0, "
+            f"ALTER COLUMN {column} SET DEFAULT false, "
+            f"ALTER COLUMN {column} SET NOT NULL"
+        ))
+
+
+def create_missing_indexes(conn):
+    """기존 테이블에 새로 추가된 인덱스 생성 (create_all은 이미 있는 테이블의 인덱스를 만들지 않음)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
 
 def init_db():
     """데이터베이스 테이블 생성"""
     print("🔨 데이터베이스 테이블 생성 중...")
+    load_all_models()
     Base.metadata.create_all(bind=engine)
+    
+    # 기존 DB 업그레이드 (여러 번 실행해도 안전)
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            upgrade_boolean_flags(conn)
+        create_missing_indexes(conn)
     print("✅ 데이터베이스 테이블 생성 완료!")
 
 if __name__ == "__main__":
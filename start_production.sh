@@ -25,7 +25,9 @@ python init_db.py
 
 # 서비스 시작
 echo "🌐 FastAPI 서버 시작 (포트 8001)..."
-uvicorn fastapi_app.main:app --host 0.0.0.0 --port 8001 --workers 4 &
+# WebSocket 죽은 연결은 프로토콜 수준 ping/pong으로 정리 (20초 간격, 20초 무응답 시 종료)
+uvicorn fastapi_app.main:app --host 0.0.0.0 --port 8001 --workers 4 \
+    --ws-ping-interval 20 --ws-ping-timeout 20 &
 FASTAPI_PID=$!
 
 echo "⏳ Celery Worker 시작..."